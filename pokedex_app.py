@@ -1,89 +1,173 @@
+import logging
 import streamlit as st
 import requests
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import zip_longest
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
 
 # URL base da API.
 BASE_URL = "https://pokeapi.co/api/v2/pokemon/"
+# Quantos Pokémons aparecem no seletor.
+POKEMON_LIMIT = 1025
+# Tempo máximo (em segundos) de espera por uma resposta da API.
+TIMEOUT = 5
+# Inverso de 255 (um valor máximo comum para status), usado para normalizar as barras de status.
+# Multiplicar por ele é o mesmo que dividir por 255.
+INV_255 = 1 / 255.0
+# Por quanto tempo (em segundos) as respostas da API ficam salvas em disco: um dia.
+CACHE_EXPIRE = 86400
+# Número de requisições feitas em paralelo ao pré-carregar vários Pokémons.
+MAX_WORKERS = 16
+# Quantos Pokémons são pré-carregados ao abrir o app (os 151 de Kanto).
+PREFETCH_LIMIT = 151
 
+# Logger do módulo. As mensagens de depuração só aparecem se o nível DEBUG for ativado.
+logger = logging.getLogger(__name__)
+
+# Sessão única reaproveitada em todas as requisições.
+# O Streamlit roda o script inteiro a cada interação, então a sessão é criada com st.cache_resource:
+# assim ela (e a conexão aberta com a pokeapi.co, keep-alive) sobrevive entre as execuções e não
+# refazemos o handshake a cada busca.
+# As respostas também ficam salvas em disco (pokeapi.sqlite) por um dia, então continuam valendo
+# mesmo depois de reiniciar o app (o cache do Streamlit só dura enquanto o processo estiver rodando).
+# Com cache_control=True, os cabeçalhos Cache-Control e ETag da API são respeitados: uma resposta
+# vencida é revalidada com If-None-Match em vez de ser baixada de novo.
+@st.cache_resource(show_spinner=False)
+def get_session():
+    session = CachedSession(
+        "pokeapi.sqlite", expire_after=CACHE_EXPIRE, allowable_methods=("GET",), cache_control=True,
+    )
+    session.headers.update({"User-Agent": "poo-pokedex/1.0"})
+    # Erros temporários do servidor (5xx) são repetidos até 3 vezes, com uma pequena espera entre as tentativas,
+    # aproveitando a mesma conexão em vez de deixar o erro chegar ao usuário.
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+    return session
+
+# Erros que podem acontecer ao buscar e ler uma resposta da API.
+# O JSON é lido com orjson (bem mais rápido que response.json()), que tem a sua própria exceção.
+FETCH_ERRORS = (requests.exceptions.RequestException, orjson.JSONDecodeError)
+
+# Um Pokémon já com todos os seus detalhes. É imutável (frozen), então pode ser guardado
+# inteiro no cache do Streamlit e reaproveitado entre as interações.
+@dataclass(frozen=True, slots=True)
 class Pokemon:
-    # O construtor é chamado quando criamos um novo objeto Pokemon.
-    def __init__(self, name, url):
-        # Armazena o nome e a URL.
-        self.name = name.title()
-        self.url = url
-        # Inicializamos todos os outros atributos como None (nulo).
-        # Eles serão preenchidos pelo método fetch_details.
-        self.id = None
-        self.tipos = []
-        self.habilidades = []
-        self.altura = None
-        self.peso = None
-        self.imagem_url = None # Atributo para a URL da imagem.
-        self.stats = {}
-
-    # Método para buscar todos os detalhes do Pokémon na API.
-    def fetch_details(self):
+    name: str
+    url: str
+    id: int
+    tipos: tuple[str, ...]
+    habilidades: tuple[str, ...]
+    altura: float
+    peso: float
+    imagem_url: str | None  # URL da imagem (None se a API não tiver uma).
+    stats: tuple[tuple[str, int], ...]  # Pares (nome, valor), ex.: ("Special Attack", 65).
+
+    # Cria o Pokémon a partir do JSON já baixado da API.
+    @classmethod
+    def from_data(cls, url, data):
         # ----- PONTO DE VERIFICAÇÃO 1 -----
-        # Este print aparecerá no seu terminal.
-        print(f"--- Buscando dados para: {self.name} ---")
-
-        try:
-            # Faz a requisição para a API.
-            response = requests.get(self.url)
-            # Verifica se a requisição deu certo.
-            response.raise_for_status()
-            # Converte a resposta para o formato JSON (dicionário Python).
-            data = response.json()
-
-            # Extração segura dos dados. .get() evita erros se a chave não existir.
-            self.id = data.get('id')
-            self.altura = data.get('height', 0) / 10
-            self.peso = data.get('weight', 0) / 10
-
-            # --- Extração segura e verificada da IMAGEM ---
-            # Navegamos passo a passo, usando .get() com um dicionário vazio {} como padrão.
-            sprites = data.get('sprites', {})
-            other = sprites.get('other', {})
-            official_artwork = other.get('official-artwork', {})
-            # A URL final. Se qualquer passo anterior falhar, o resultado será None.
-            url_encontrada = official_artwork.get('front_default')
-
-            self.imagem_url = url_encontrada
-
-            # ----- PONTO DE VERIFICAÇÃO 2 -----
-            # Este print nos dirá se a URL foi encontrada ou não.
-            print(f"URL da Imagem: {self.imagem_url}")
-
-            # Extrai os tipos, usando uma lista vazia [] como padrão.
-            self.tipos = [t['type']['name'].title() for t in data.get('types', [])]
-            # Extrai as habilidades.
-            self.habilidades = [a['ability']['name'].title() for a in data.get('abilities', [])]
-
-            # Extrai os status.
-            self.stats = {}
-            for stat in data.get('stats', []):
-                stat_name = stat['stat']['name'].replace('-', ' ').title()
-                base_stat = stat['base_stat']
-                self.stats[stat_name] = base_stat
-
-        except requests.exceptions.RequestException as e:
-            st.error(f"Erro de rede ao buscar {self.name}: {e}")
-        except Exception as e:
-            # Captura qualquer outro erro que possa ocorrer durante a extração dos dados.
-            st.error(f"Erro ao processar os dados de {self.name}: {e}")
-            print(f"OCORREU UM ERRO AO PROCESSAR {self.name}: {e}")
-
-# Função para buscar a lista dos 151 Pokémons (com cache para não recarregar toda hora).
-@st.cache_data
+        # Esta mensagem aparecerá no seu terminal com o log em nível DEBUG.
+        logger.debug("--- Lendo os dados de: %s ---", data.get('name'))
+
+        # --- Extração segura e verificada da IMAGEM ---
+        # Navegamos passo a passo, usando .get() com um dicionário vazio {} como padrão.
+        sprites = data.get('sprites', {})
+        other = sprites.get('other', {})
+        official_artwork = other.get('official-artwork', {})
+        # A URL final. Se qualquer passo anterior falhar, o resultado será None.
+        imagem_url = official_artwork.get('front_default')
+
+        # ----- PONTO DE VERIFICAÇÃO 2 -----
+        # Esta mensagem nos dirá se a URL foi encontrada ou não.
+        logger.debug("URL da Imagem: %s", imagem_url)
+
+        # Extração segura dos dados. .get() evita erros se a chave não existir.
+        # Os padrões são tuplas vazias () para não criar uma lista nova a cada chamada.
+        return cls(
+            name=data['name'].title(),
+            url=url,
+            # O número é obrigatório (é exibido como "#001"), então, como o nome, não usa .get().
+            id=data['id'],
+            tipos=tuple(t['type']['name'].title() for t in data.get('types', ())),
+            habilidades=tuple(a['ability']['name'].title() for a in data.get('abilities', ())),
+            altura=data.get('height', 0) / 10,
+            peso=data.get('weight', 0) / 10,
+            imagem_url=imagem_url,
+            stats=tuple(
+                (s['stat']['name'].replace('-', ' ').title(), s['base_stat'])
+                for s in data.get('stats', ())
+            ),
+        )
+
+# Busca o JSON de uma única URL.
+def _get_json(url):
+    response = get_session().get(url, timeout=TIMEOUT)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+# Busca e monta um único Pokémon (com cache por URL, para rever um Pokémon sem nova requisição).
+# Erros de rede ou de leitura do JSON são levantados, e o Streamlit não guarda no cache chamadas que falharam.
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def load_pokemon(url):
+    return Pokemon.from_data(url, _get_json(url))
+
+# Versão de load_pokemon usada no pré-carregamento. Devolve None em caso de erro,
+# pois roda fora da thread principal e não pode chamar st.error.
+def _try_load_pokemon(url):
+    try:
+        return Pokemon.from_data(url, _get_json(url))
+    except FETCH_ERRORS:
+        return None
+    except Exception:
+        logger.exception("OCORREU UM ERRO AO PROCESSAR %s", url)
+        return None
+
+# Busca vários Pokémons em paralelo, todos pela mesma sessão (get_session), e devolve os resultados na mesma ordem.
+def fetch_many(urls):
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return list(executor.map(_try_load_pokemon, urls))
+
+# Baixa todos os Pokémons das URLs de uma vez (com cache, para não repetir a cada interação).
+# Devolve um dicionário {url: Pokemon}; URLs que falharam ficam com None.
+@st.cache_data(show_spinner=False)
+def prefetch_all(urls):
+    return dict(zip(urls, fetch_many(urls)))
+
+# Busca a lista de Pokémons, como pares (nome, url), uma única vez por processo.
+# st.cache_resource devolve sempre o mesmo objeto (sem copiar a cada execução do script) para todas as
+# sessões, por isso tudo é guardado em tuplas, que não podem ser alteradas por engano.
+# Erros são levantados e não ficam no cache.
+@st.cache_resource(show_spinner=False)
+def _raw_list(limit):
+    results = _get_json(f"{BASE_URL}?limit={limit}")['results']
+    return tuple((p['name'], p['url']) for p in results)
+
+# Função para buscar a lista de Pokémons.
 def get_pokemon_list():
-    url = f"{BASE_URL}?limit=1025"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        return data['results']
-    except requests.exceptions.RequestException as e:
+        return _raw_list(POKEMON_LIMIT)
+    except FETCH_ERRORS as e:
         st.error(f"Não foi possível carregar a lista de Pokémons da API. Verifique sua conexão. Erro: {e}")
-        return []
+        return ()
+
+# Deixa a primeira letra do nome maiúscula. Para os nomes da API (sempre em minúsculas)
+# o resultado é igual ao de .title().
+# Nomes com hífen ("mr-mime", "ho-oh") precisam de maiúscula em cada parte, então usam .title().
+def _cap(name):
+    if '-' in name:
+        return name.title()
+    return name[:1].upper() + name[1:]
+
+# Monta os rótulos do seletor ("1 - Bulbasaur", ...) uma única vez (com cache).
+# O cache é identificado só pelo limite: o "_" no início de _pokemon_list faz o Streamlit
+# não calcular o hash da lista inteira a cada chamada.
+@st.cache_data
+def build_names(limit, _pokemon_list):
+    return [f"{i+1} - {_cap(name)}" for i, (name, _url) in enumerate(_pokemon_list)]
 
 # Configurações da página.
 st.set_page_config(page_title="Pokédex", page_icon="🔴")
@@ -93,19 +177,48 @@ st.title("Pokédex - Kanto")
 pokemon_list = get_pokemon_list()
 
 if pokemon_list:
-    # Cria a lista de nomes para o seletor.
-    pokemon_names = [f"{i+1} - {p['name'].title()}" for i, p in enumerate(pokemon_list)]
-    
+    # O Streamlit roda o script inteiro a cada interação. O que só precisa ser montado uma vez
+    # (detalhes pré-carregados e nomes do seletor) fica guardado em st.session_state.
+    if 'detalhes' not in st.session_state:
+        # Pré-carrega, de uma vez só, os detalhes de todos os Pokémons de Kanto.
+        with st.spinner("Carregando Kanto..."):
+            st.session_state.detalhes = prefetch_all(tuple(url for _name, url in pokemon_list[:PREFETCH_LIMIT]))
+    if 'names' not in st.session_state:
+        # Cria a lista de nomes para o seletor.
+        st.session_state.names = build_names(POKEMON_LIMIT, pokemon_list)
+    pokemon_names = st.session_state.names
+
     # Cria o seletor na barra lateral.
-    selected_pokemon_name = st.sidebar.selectbox("Escolha um Pokémon:", pokemon_names)
+    # As opções são os próprios índices da lista, então o valor escolhido já é a posição do Pokémon.
+    selected_index = st.sidebar.selectbox(
+        "Escolha um Pokémon:",
+        range(len(pokemon_names)),
+        format_func=pokemon_names.__getitem__,
+    )
+
+    # Só busca o Pokémon de novo se a seleção mudou desde a última execução.
+    if st.session_state.get('selected_index') != selected_index:
+        # Acha os dados do Pokémon selecionado.
+        selected_name, selected_url = pokemon_list[selected_index]
+        selected_name = selected_name.title()
 
-    # Acha os dados do Pokémon selecionado.
-    selected_index = pokemon_names.index(selected_pokemon_name)
-    selected_pokemon_data = pokemon_list[selected_index]
+        # Usa o Pokémon pré-carregado; se não estiver lá, busca e monta só este.
+        pokemon = st.session_state.detalhes.get(selected_url)
+        if pokemon is None:
+            try:
+                pokemon = load_pokemon(selected_url)
+            except FETCH_ERRORS as e:
+                st.error(f"Erro de rede ao buscar {selected_name}: {e}")
+                st.stop()
+            except Exception as e:
+                # Captura qualquer outro erro que possa ocorrer durante a extração dos dados.
+                st.error(f"Erro ao processar os dados de {selected_name}: {e}")
+                logger.exception("OCORREU UM ERRO AO PROCESSAR %s", selected_name)
+                st.stop()
 
-    # Cria o objeto Pokemon e busca seus detalhes.
-    pokemon = Pokemon(selected_pokemon_data['name'], selected_pokemon_data['url'])
-    pokemon.fetch_details()
+        st.session_state.pokemon = pokemon
+        st.session_state.selected_index = selected_index
+    pokemon = st.session_state.pokemon
 
     # Organiza a exibição em colunas.
     col1, col2 = st.columns([1, 2])
@@ -128,9 +241,17 @@ if pokemon_list:
 
     # Exibe os status base.
     st.subheader("Status Base")
-    # Itera sobre os status e os exibe.
-    for stat_name, stat_value in pokemon.stats.items():
-        st.text(stat_name)
-        # A barra de progresso vai de 0 a 1. Dividimos por 255 (um valor máximo comum para status).
-        st.progress(stat_value / 255)
+    # Exibe os status em duas colunas, de dois em dois.
+    stat_col1, stat_col2 = st.columns(2)
+    # A barra de progresso vai de 0 a 1, então normalizamos todos os valores de uma vez antes de desenhar.
+    norms = [(n, v * INV_255) for n, v in pokemon.stats]
+    for left, right in zip_longest(norms[::2], norms[1::2]):
+        with stat_col1:
+            st.text(left[0])
+            st.progress(left[1])
+        # Com um número ímpar de status, o último par não tem o da direita.
+        if right is not None:
+            with stat_col2:
+                st.text(right[0])
+                st.progress(right[1])
 